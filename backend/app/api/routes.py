@@ -1,18 +1,36 @@
-from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form
+from fastapi import APIRouter, HTTPException, Depends, Request, UploadFile, File, Form, Header
 from fastapi.responses import JSONResponse
 from typing import Optional, List, Dict, Any
 from app.models.schemas import AnalyticsResponse, FileData, QueryIntent
 from app.services.analytics_service import analyze_data
 from app.services.deepseek_service import call_deepseek_api
 from app.services.file_service import convert_to_csv
+from concurrent.futures import ThreadPoolExecutor
 import json
 import logging
+import os
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.ipc as paipc
 import io
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Cap on retained CSV rows; preprocessing downsamples to ~200 rows anyway,
+# so parsing an entire multi-GB upload into memory buys nothing
+MAX_UPLOAD_ROWS = int(os.getenv("MAX_UPLOAD_ROWS", "1000000"))
+
+# Hard cap on upload size, checked before any parsing work happens
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(100 * 1024 * 1024)))
+
+# Fan out per-column conversion only when the table is wide and tall enough
+# for the thread handoff to pay for itself
+PARALLEL_COLUMN_THRESHOLD = 8
+PARALLEL_ROW_THRESHOLD = 10000
+
 @router.post("/analyze", response_model=AnalyticsResponse)
 async def analyze_data_endpoint(
     query: str = Form(...),
@@ -34,6 +52,9 @@ async def analyze_data_endpoint(
         result = await analyze_data(query, file_data, api_key)
         
         return result
+    except HTTPException:
+        # Preserve the status codes raised during upload validation
+        raise
     except ValueError as e:
         # Handle specific error types with appropriate status codes
         logger.error(f"Value error in analyze_data_endpoint: {str(e)}")
@@ -42,6 +63,90 @@ async def analyze_data_endpoint(
         logger.error(f"Error in analyze_data_endpoint: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/analyze-arrow", response_model=AnalyticsResponse)
+async def analyze_arrow_endpoint(
+    request: Request,
+    query: str,
+    api_key: str = Header(..., alias="X-API-Key")
+):
+    """
+    Analyze data supplied as an Arrow IPC stream in the request body.
+
+    Clients that already hold an Arrow table can serialize it with
+    pyarrow.ipc.new_stream and POST the raw bytes, skipping the JSON
+    list-of-lists encoding entirely. The query is passed as a query
+    parameter; the API key travels in the X-API-Key header so it never
+    lands in access logs or proxy records.
+
+    - **query**: The analysis query
+    - **X-API-Key**: DeepSeek API key (header)
+    """
+    try:
+        body = await request.body()
+        table = paipc.open_stream(pa.BufferReader(body)).read_all()
+        file_data = table_to_file_data(table)
+
+        result = await analyze_data(query, file_data, api_key)
+
+        return result
+    except pa.ArrowInvalid as e:
+        logger.error(f"Invalid Arrow IPC payload in analyze_arrow_endpoint: {str(e)}")
+        raise HTTPException(status_code=400, detail="Request body is not a valid Arrow IPC stream.")
+    except ValueError as e:
+        logger.error(f"Value error in analyze_arrow_endpoint: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error in analyze_arrow_endpoint: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/analyze-csv", response_model=AnalyticsResponse)
+async def analyze_csv_endpoint(
+    request: Request,
+    query: str,
+    api_key: str = Header(..., alias="X-API-Key")
+):
+    """
+    Analyze a raw CSV request body.
+
+    Bypasses multipart parsing and Starlette's 1 MB disk spool entirely:
+    the body streams into a bounded in-memory buffer and is parsed with
+    Arrow's incremental CSV reader. The query is passed as a query
+    parameter; the API key travels in the X-API-Key header so it never
+    lands in access logs or proxy records.
+
+    - **query**: The analysis query
+    - **X-API-Key**: DeepSeek API key (header)
+    """
+    try:
+        buffer = io.BytesIO()
+        size = 0
+        async for chunk in request.stream():
+            size += len(chunk)
+            if size > MAX_UPLOAD_BYTES:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"File too large. Maximum upload size is {MAX_UPLOAD_BYTES} bytes."
+                )
+            buffer.write(chunk)
+        buffer.seek(0)
+
+        file_data = table_to_file_data(read_csv_capped(buffer))
+
+        result = await analyze_data(query, file_data, api_key)
+
+        return result
+    except HTTPException:
+        raise
+    except pa.ArrowInvalid as e:
+        logger.error(f"Invalid CSV payload in analyze_csv_endpoint: {str(e)}")
+        raise HTTPException(status_code=400, detail="Request body is not valid CSV.")
+    except ValueError as e:
+        logger.error(f"Value error in analyze_csv_endpoint: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error in analyze_csv_endpoint: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/health")
 async def health_check():
     """Health check endpoint to verify the API is running."""
@@ -67,34 +172,126 @@ async def convert_to_csv_endpoint(data: FileData):
 
 async def process_file(file: UploadFile) -> FileData:
     """Process the uploaded file and convert it to FileData format"""
+    # Reject unsupported types and oversized bodies up front, before any
+    # bytes are parsed
+    if not file.filename or not file.filename.endswith(('.csv', '.xlsx', '.xls')):
+        raise HTTPException(status_code=400, detail="Unsupported file format. Please upload a CSV or Excel file.")
+    _ensure_within_size_limit(file)
+
     try:
-        content = await file.read()
-        
         if file.filename.endswith('.csv'):
-            df = pd.read_csv(io.BytesIO(content))
-        elif file.filename.endswith(('.xlsx', '.xls')):
-            df = pd.read_excel(io.BytesIO(content))
-        else:
-            raise HTTPException(status_code=400, detail="Unsupported file format. Please upload a CSV or Excel file.")
-        
-        # Convert DataFrame to FileData format
-        headers = df.columns.tolist()
-        rows = df.values.tolist()
-        
-        # Ensure all data is serializable
-        sanitized_rows = []
-        for row in rows:
-            sanitized_row = []
-            for cell in row:
-                if pd.isna(cell):
-                    sanitized_row.append(None)
-                elif isinstance(cell, (pd.Timestamp, pd.Period)):
-                    sanitized_row.append(str(cell))
-                else:
-                    sanitized_row.append(cell)
-            sanitized_rows.append(sanitized_row)
-        
-        return FileData(headers=headers, rows=sanitized_rows)
+            # Parse straight from the spooled upload file instead of buffering
+            # a second copy of the payload
+            return table_to_file_data(read_csv_capped(file.file))
+
+        content = await file.read()
+
+        # Arrow-backed dtypes keep strings out of object columns, so
+        # notna() is a null-bitmap check instead of per-cell isinstance.
+        # calamine (Rust) parses .xlsx far faster than openpyxl; legacy
+        # .xls stays on the default engine.
+        engine = 'calamine' if file.filename.endswith('.xlsx') else None
+        df = pd.read_excel(io.BytesIO(content), engine=engine, dtype_backend='pyarrow')
+
+        return dataframe_to_file_data(df)
     except Exception as e:
         logger.error(f"Error processing file: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
+
+def dataframe_to_file_data(df: pd.DataFrame) -> FileData:
+    """Convert a pandas DataFrame to FileData in a single pass.
+
+    Datetime-like columns are stringified column-wise, then NaN/NaT become
+    None via one vectorized where(notna). The astype(object) cast happens
+    once here, so df.values never forces a lossy common-dtype upcast of
+    numeric columns.
+    """
+    ts_columns = [
+        col for col in df.columns
+        if pd.api.types.is_datetime64_any_dtype(df[col])
+        or isinstance(df[col].dtype, pd.PeriodDtype)
+        or (isinstance(df[col].dtype, pd.ArrowDtype) and pa.types.is_temporal(df[col].dtype.pyarrow_dtype))
+    ]
+    if len(ts_columns) > 0:
+        mask = df[ts_columns].notna()
+        for col in ts_columns:
+            dtype = df[col].dtype
+            # Arrow-backed timestamps stringify as 2024-01-01T00:00:00.000000;
+            # route them through datetime64 so the text stays the
+            # "2024-01-01 00:00:00" form the frontend and prompts always saw
+            if isinstance(dtype, pd.ArrowDtype) and (
+                pa.types.is_timestamp(dtype.pyarrow_dtype)
+                or pa.types.is_date(dtype.pyarrow_dtype)
+            ):
+                df[col] = df[col].astype('datetime64[ns]')
+        # Mask nulls through the cast: astype(str) alone would turn NaT into
+        # the literal string "NaT" on pandas 2.x
+        df[ts_columns] = df[ts_columns].astype(str).where(mask)
+
+    rows = df.astype(object).where(pd.notna(df), None).values.tolist()
+
+    return FileData(headers=df.columns.tolist(), rows=rows)
+
+def read_csv_capped(source) -> pa.Table:
+    """Parse CSV from a file-like object with Arrow's incremental reader.
+
+    Peak memory stays at one parse batch plus the retained rows, and
+    collection stops once MAX_UPLOAD_ROWS is reached, so inputs larger than
+    the row cap never fully materialize.
+    """
+    reader = pacsv.open_csv(
+        source,
+        read_options=pacsv.ReadOptions(use_threads=True, block_size=1 << 20)
+    )
+    batches = []
+    rows_read = 0
+    truncated = False
+    for batch in reader:
+        if rows_read + batch.num_rows > MAX_UPLOAD_ROWS:
+            batch = batch.slice(0, MAX_UPLOAD_ROWS - rows_read)
+            truncated = True
+        batches.append(batch)
+        rows_read += batch.num_rows
+        if rows_read >= MAX_UPLOAD_ROWS:
+            # Peek one more batch to distinguish an exact fit from a cap hit
+            truncated = truncated or next(iter(reader), None) is not None
+            break
+    if truncated:
+        logger.warning(f"Upload truncated at {rows_read} rows (MAX_UPLOAD_ROWS={MAX_UPLOAD_ROWS})")
+    return pa.Table.from_batches(batches, schema=reader.schema)
+
+def _ensure_within_size_limit(file: UploadFile) -> None:
+    """Reject uploads larger than MAX_UPLOAD_BYTES before parsing them."""
+    file.file.seek(0, os.SEEK_END)
+    size = file.file.tell()
+    file.file.seek(0)
+    if size > MAX_UPLOAD_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"File too large ({size} bytes). Maximum upload size is {MAX_UPLOAD_BYTES} bytes."
+        )
+
+def _normalize_column(column: pa.ChunkedArray) -> List[Any]:
+    """Cast temporal columns to strings and unbox the column to Python values."""
+    if pa.types.is_temporal(column.type):
+        column = pc.cast(column, pa.string())
+    return column.to_pylist()
+
+def table_to_file_data(table: pa.Table) -> FileData:
+    """Convert a pyarrow Table to FileData without materializing a DataFrame.
+
+    Arrow nulls already come back as None from to_pylist(), so no per-cell
+    sanitization is needed; temporal columns are cast to strings so the
+    payload stays JSON-serializable. Columns are independent, and Arrow's
+    C++ conversion releases the GIL, so wide tables are converted in
+    parallel across a thread pool.
+    """
+    if table.num_columns >= PARALLEL_COLUMN_THRESHOLD and table.num_rows >= PARALLEL_ROW_THRESHOLD:
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            columns = list(executor.map(_normalize_column, table.columns))
+    else:
+        columns = [_normalize_column(column) for column in table.columns]
+
+    rows = [list(row) for row in zip(*columns)] if columns else []
+
+    return FileData(headers=table.column_names, rows=rows)
\ No newline at end of file
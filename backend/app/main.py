@@ -1,12 +1,30 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.routes import router as api_router
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+import logging.config
 import os
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+# Configure logging once for the whole app; modules just call
+# logging.getLogger(__name__) instead of racing basicConfig at import time
+logging.config.dictConfig({
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "default": {"format": "%(asctime)s %(levelname)s %(name)s: %(message)s"},
+    },
+    "handlers": {
+        "console": {"class": "logging.StreamHandler", "formatter": "default"},
+    },
+    "root": {"level": os.getenv("LOG_LEVEL", "INFO"), "handlers": ["console"]},
+})
+
+from app.api.routes import router as api_router
+
 # Get environment variables
 allowed_origins = os.getenv("ALLOWED_ORIGINS", "http://localhost:5173,http://localhost:3000").split(",")
 port = int(os.getenv("PORT", "8000"))
@@ -15,7 +33,8 @@ host = os.getenv("HOST", "0.0.0.0")
 app = FastAPI(
     title="Data Analytics API",
     description="API for data analytics using DeepSeek models",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -27,6 +46,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Tabular JSON/CSV payloads compress extremely well; skip tiny responses
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # Include API routes
 app.include_router(api_router, prefix="/api")
 
@@ -44,4 +66,15 @@ async def root_health_check():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("app.main:app", host=host, port=port, reload=True) 
\ No newline at end of file
+    # uvloop/httptools cut per-request dispatch and parsing overhead; the
+    # auto-reloader and single worker are kept for DEBUG runs only
+    debug = os.getenv("DEBUG", "false").lower() == "true"
+    uvicorn.run(
+        "app.main:app",
+        host=host,
+        port=port,
+        reload=debug,
+        loop="uvloop",
+        http="httptools",
+        workers=1 if debug else int(os.getenv("WORKERS", os.cpu_count() or 1))
+    )
\ No newline at end of file
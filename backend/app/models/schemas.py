@@ -1,10 +1,27 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from typing import List, Dict, Any, Optional, Union
+import numpy as np
 
 class FileData(BaseModel):
+    """Tabular payload exchanged with the frontend.
+
+    The wire format stays row-major (headers + rows) for API
+    compatibility; as_array() exposes a cached column-indexable ndarray so
+    services can project and sample without re-walking the row lists.
+    """
     headers: List[str]
     rows: List[List[Any]]
 
+    _array: Optional[Any] = PrivateAttr(default=None)
+
+    def as_array(self) -> np.ndarray:
+        """Return rows as a 2-D object ndarray, built once per instance."""
+        if self._array is None:
+            self._array = np.asarray(self.rows, dtype=object).reshape(
+                len(self.rows), len(self.headers)
+            )
+        return self._array
+
 class VisualizationData(BaseModel):
     type: str
     data: List[Dict[str, Any]]
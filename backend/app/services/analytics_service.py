@@ -2,13 +2,17 @@ from app.models.schemas import FileData, AnalyticsResponse, QueryIntent
 from app.services.preprocessing_service import preprocess_data, analyze_query_and_identify_columns
 from app.services.deepseek_service import call_deepseek_api
 from typing import Dict, Any, List
-import json
 import logging
+import os
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Below this many cells the preprocessing LLM call costs a full roundtrip
+# without meaningfully shrinking the payload, so it is skipped entirely
+SKIP_PREPROCESS_THRESHOLD = int(os.getenv("AIMPLIFY_SKIP_PREPROCESS_THRESHOLD", "2000"))
+
+DEFAULT_INTENT = {"analysisType": "descriptive", "visualizationType": "none", "aggregationType": "none"}
+
 async def analyze_data(query: str, data: FileData, api_key: str) -> AnalyticsResponse:
     """
     Main function to analyze data using DeepSeek API
@@ -34,21 +38,28 @@ async def analyze_data(query: str, data: FileData, api_key: str) -> AnalyticsRes
         logger.info(f"Starting analysis with AI-driven preprocessing...")
         logger.info(f"Dataset size: {len(data.rows)} rows, {len(data.headers)} columns")
         
-        # Step 1: Analyze query intent and identify relevant columns in one API call
-        try:
-            query_intent, relevant_columns = await analyze_query_and_identify_columns(query, data, api_key)
-            logger.info(f"Query intent: {query_intent}")
-            logger.info(f"Identified {len(relevant_columns)} relevant columns: {', '.join(relevant_columns)}")
-            
-            # Step 2: Filter and sample data
-            preprocessed_data = await preprocess_data(query, data, api_key, query_intent, relevant_columns)
-            logger.info(f"Preprocessed data: {len(preprocessed_data.rows)} rows, {len(preprocessed_data.headers)} columns")
-        except Exception as preprocess_error:
-            logger.error(f"Error in preprocessing: {str(preprocess_error)}")
-            # Use default intent and original data if preprocessing fails
-            query_intent = {"analysisType": "descriptive", "visualizationType": "none", "aggregationType": "none"}
+        if len(data.rows) * len(data.headers) < SKIP_PREPROCESS_THRESHOLD:
+            # Small enough to send as-is; skipping the preprocessing LLM call
+            # halves end-to-end latency
+            logger.info("Dataset below preprocessing threshold, skipping preprocessing")
+            query_intent = dict(DEFAULT_INTENT)
             preprocessed_data = data
-            logger.info("Using original data due to preprocessing error")
+        else:
+            # Step 1: Analyze query intent and identify relevant columns in one API call
+            try:
+                query_intent, relevant_columns = await analyze_query_and_identify_columns(query, data, api_key)
+                logger.info(f"Query intent: {query_intent}")
+                logger.info(f"Identified {len(relevant_columns)} relevant columns: {', '.join(relevant_columns)}")
+
+                # Step 2: Filter and sample data
+                preprocessed_data = await preprocess_data(query, data, api_key, query_intent, relevant_columns)
+                logger.info(f"Preprocessed data: {len(preprocessed_data.rows)} rows, {len(preprocessed_data.headers)} columns")
+            except Exception as preprocess_error:
+                logger.error(f"Error in preprocessing: {str(preprocess_error)}")
+                # Use default intent and original data if preprocessing fails
+                query_intent = dict(DEFAULT_INTENT)
+                preprocessed_data = data
+                logger.info("Using original data due to preprocessing error")
         
         # Step 3: Call DeepSeek API for analysis
         result = await call_deepseek_api(query, preprocessed_data, api_key, query_intent)
@@ -1,15 +1,55 @@
 from app.models.schemas import FileData, AnalyticsResponse
 from app.services.file_service import convert_to_csv
+from cachetools import LRUCache
 from typing import Dict, Any, List
+import asyncio
+import httpx
 import openai
+import orjson
 import logging
-import json
+import os
 import re
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Rows beyond this never fit in the model context anyway, so don't waste
+# time serializing them into the prompt
+MAX_PROMPT_ROWS = int(os.getenv("DEEPSEEK_MAX_PROMPT_ROWS", "2000"))
+
+# Matches the outermost JSON object in the model response; compiled once
+# at import instead of on every call
+_JSON_RE = re.compile(r'\{[\s\S]*\}')
+
+class _ClientCache(LRUCache):
+    """LRU cache that closes evicted clients so their pools don't leak."""
+
+    def popitem(self):
+        key, client = super().popitem()
+        try:
+            asyncio.get_running_loop().create_task(client.close())
+        except RuntimeError:
+            # No running loop (e.g. interpreter shutdown); let GC handle it
+            pass
+        return key, client
+
+# Cache clients per API key so repeat requests reuse the underlying HTTP
+# connection pool instead of paying TLS/socket setup on every call. The
+# cache is bounded — keys are user-supplied, so an unbounded dict would
+# let arbitrary requests pin connection pools forever.
+_clients: _ClientCache = _ClientCache(maxsize=32)
+
+def get_client(api_key: str) -> openai.AsyncOpenAI:
+    """Return a cached async OpenAI client for the given API key."""
+    key = api_key.strip()
+    client = _clients.get(key)
+    if client is None:
+        client = _clients.setdefault(key, openai.AsyncOpenAI(
+            api_key=key,
+            base_url="https://api.deepseek.com/v1",
+            timeout=httpx.Timeout(120.0, connect=5.0),
+        ))
+    return client
+
 async def call_deepseek_api(
     query: str, 
     data: FileData, 
@@ -32,13 +72,12 @@ async def call_deepseek_api(
         if not api_key or not api_key.strip():
             raise ValueError("DeepSeek API key is required")
             
-        client = openai.OpenAI(
-            api_key=api_key.strip(),
-            base_url="https://api.deepseek.com/v1",
-        )
-        
-        # Convert data to CSV format for easier processing
-        csv_data = convert_to_csv(data)
+        client = get_client(api_key)
+
+        # Convert data to CSV format for easier processing; preprocessed data
+        # is already ~200 rows, the cap only bites when preprocessing failed
+        # and the original data fell through
+        csv_data = convert_to_csv(data, max_rows=MAX_PROMPT_ROWS)
         
         # Create intent info string
         intent_info = ""
@@ -72,7 +111,7 @@ Make sure your entire response can be parsed as valid JSON."""
         
         # Call the DeepSeek API
         logger.info("Sending request to DeepSeek API...")
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model="deepseek-reasoner",
             messages=[
                 {"role": "system", "content": system_prompt},
@@ -86,12 +125,12 @@ Make sure your entire response can be parsed as valid JSON."""
         content = response.choices[0].message.content or '{}'
         
         # Extract JSON from the response
-        json_match = re.search(r'\{[\s\S]*\}', content, re.DOTALL)
+        json_match = _JSON_RE.search(content)
         json_content = json_match.group(0) if json_match else content
         
         try:
             # Parse the response
-            parsed_response = json.loads(json_content.strip())
+            parsed_response = orjson.loads(json_content.strip())
             
             # Validate the response structure
             if not parsed_response.get("answer"):
@@ -104,7 +143,7 @@ Make sure your entire response can be parsed as valid JSON."""
             )
             
             return result
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(f"Error parsing DeepSeek response: {str(e)}")
             # Return a basic response with the raw content
             return AnalyticsResponse(answer=content)
@@ -1,40 +1,36 @@
 from app.models.schemas import FileData
 import json
 import logging
-from typing import List, Any
-import io
-import csv
+from typing import List, Any, Optional
+import pandas as pd
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def convert_to_csv(data: FileData) -> str:
+def convert_to_csv(data: FileData, max_rows: Optional[int] = None) -> str:
     """
     Convert FileData to CSV format.
 
     Args:
         data: The FileData instance containing headers and rows.
+        max_rows: Optional cap on the number of rows serialized. Truncating
+            before serialization avoids building a huge string that the
+            consumer would discard anyway.
 
     Returns:
         CSV string representation of the provided data.
     """
     try:
-        # Create an in-memory text stream for CSV output
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Write the header row
-        writer.writerow(data.headers)
-        
-        # Write all data rows
-        writer.writerows(data.rows)
-        
-        # Retrieve the CSV content from the stream
-        csv_content = output.getvalue()
-        output.close()
-        
-        return csv_content
+        rows = data.rows
+        if max_rows is not None and len(rows) > max_rows:
+            logger.info(f"Truncating CSV output from {len(rows)} to {max_rows} rows")
+            rows = rows[:max_rows]
+
+        # DataFrame.to_csv runs in C with batched writes, unlike csv.writer
+        # which makes one Python call per row. dtype=object skips inference,
+        # which would otherwise upcast int columns containing None to float
+        # and serialize 2 as 2.0
+        df = pd.DataFrame(rows, columns=data.headers, dtype=object)
+        return df.to_csv(index=False)
     except Exception as e:
         logger.error(f"Error converting data to CSV: {str(e)}")
         raise
\ No newline at end of file
@@ -0,0 +1,106 @@
+from typing import Any, List, Optional, Tuple
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# sentence-transformers is optional; without it the cache simply stays off
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+EMBEDDING_MODEL = os.getenv("AIMPLIFY_EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+
+class SemanticCache:
+    """Cache keyed on query embeddings plus a dataset context hash.
+
+    Near-duplicate phrasings of a query over the same dataset hit the
+    cache, replacing a seconds-long LLM roundtrip with a millisecond
+    cosine lookup over L2-normalized embeddings. Entries are matched only
+    when their context hash equals the caller's, so the same phrasing over
+    a different dataset never produces a false hit, and expire after ttl
+    seconds so stale intents age out like the exact-match cache.
+
+    Loading the model and encoding are synchronous and can take seconds on
+    first use; async callers should run get/put via asyncio.to_thread.
+
+    The store is small (maxsize entries), so an exact dot product over the
+    embedding matrix is equivalent to a flat inner-product index without
+    the extra dependency. Disabled transparently when sentence-transformers
+    is not installed.
+    """
+
+    def __init__(self, maxsize: int = 256, threshold: float = 0.92, ttl: float = 3600.0):
+        self.maxsize = maxsize
+        self.threshold = threshold
+        self.ttl = ttl
+        self._model = None
+        self._lock = threading.Lock()
+        self._embeddings: Optional[np.ndarray] = None
+        self._entries: List[Tuple[bytes, Any, float]] = []
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the embedding backend is available."""
+        return SentenceTransformer is not None
+
+    def _encode(self, text: str) -> np.ndarray:
+        """Embed text and L2-normalize so dot products are cosines."""
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    logger.info(f"Loading embedding model {EMBEDDING_MODEL}")
+                    self._model = SentenceTransformer(EMBEDDING_MODEL)
+        vector = self._model.encode(text)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    # How many nearest neighbours to consider before the context check; the
+    # closest phrasing may belong to a different dataset
+    TOP_K = 5
+
+    def get(self, query: str, context_hash: bytes) -> Optional[Any]:
+        """Return the cached value for the closest matching query, if any.
+
+        Candidates are taken in similarity order, but a hit is only
+        accepted when its context hash matches the caller's — identical
+        phrasings over different datasets must not alias.
+        """
+        if not self.enabled or not self._entries:
+            return None
+
+        vector = self._encode(query)
+        now = time.monotonic()
+        with self._lock:
+            similarities = self._embeddings @ vector
+            top_k = np.argsort(similarities)[::-1][:self.TOP_K]
+            for index in top_k:
+                if similarities[index] < self.threshold:
+                    break
+                entry_context, value, stored_at = self._entries[index]
+                if entry_context == context_hash and now - stored_at <= self.ttl:
+                    logger.info(f"Semantic cache hit (similarity {similarities[index]:.3f})")
+                    return value
+        return None
+
+    def put(self, query: str, context_hash: bytes, value: Any) -> None:
+        """Store a value under the query's embedding and context hash."""
+        if not self.enabled:
+            return
+
+        vector = self._encode(query)
+        with self._lock:
+            if len(self._entries) >= self.maxsize:
+                # Drop the oldest entry; a small FIFO is good enough here
+                self._entries.pop(0)
+                self._embeddings = self._embeddings[1:]
+            self._entries.append((context_hash, value, time.monotonic()))
+            if self._embeddings is None:
+                self._embeddings = vector[np.newaxis, :]
+            else:
+                self._embeddings = np.vstack([self._embeddings, vector])